@@ -1,36 +1,104 @@
 import os
+import io
 import tempfile
+import hashlib
+import functools
+import json
 import uuid
 import re
+import time
+import threading
+import queue
 from datetime import datetime, timedelta
 import shutil
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import fitz
 import pdfplumber
 import pandas as pd
-from flask import Flask, request, jsonify, send_file
+import xlsxwriter
+from openpyxl.utils.exceptions import InvalidFileException
+from flask import Flask, Request, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+import orjson
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import PyPDF2
 import logging
 
+try:
+    import re2
+    HAVE_RE2 = True
+except ImportError:
+    re2 = None
+    HAVE_RE2 = False
+
+# Optional Poppler-based extractor (needs the poppler system libraries)
+try:
+    import pdftotext
+    HAVE_PDFTOTEXT = True
+except ImportError:
+    pdftotext = None
+    HAVE_PDFTOTEXT = False
+
+# Copy-on-write (the pandas 3 default): reindex, column selections and row masks share
+# data blocks instead of copying them. Frames here are never modified in place.
+pd.options.mode.copy_on_write = True
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; keys stay sorted like Flask's default"""
+    
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # jsonify() bodies go out as orjson's bytes, without a decode and re-encode
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+# Hand file bodies to a fronting proxy (nginx X-Sendfile/X-Accel) instead of streaming them
+# through the worker. Only enable when such a proxy is in front: without one, downloads are empty.
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
 CORS(app, resources={r"/api/*": {"origins": ["https://extractmsds.vercel.app"]}})
 
 
 UPLOAD_FOLDER = os.path.join(tempfile.gettempdir(), 'sds_uploads')
 PROCESSED_FOLDER = os.path.join(tempfile.gettempdir(), 'sds_processed')
+PARSE_CACHE_FOLDER = os.path.join(PROCESSED_FOLDER, 'cache')
+# Bump when parse_sds_data's output changes so cached parses from older code are not reused
+PARSE_CACHE_VERSION = 2
+SHEET_CACHE_FOLDER = os.path.join(PROCESSED_FOLDER, 'sheet_cache')
+JOBS_FOLDER = os.path.join(PROCESSED_FOLDER, 'jobs')
+# Parse and sheet cache entries unused for this long are removed by cleanup (hits refresh them)
+CACHE_MAX_AGE_HOURS = float(os.environ.get('CACHE_MAX_AGE_HOURS', '168'))
 ALLOWED_EXTENSIONS_PDF = {'pdf'}
 ALLOWED_EXTENSIONS_EXCEL = {'xlsx', 'xls'}
+# Suffix tuples for allowed_file, derived once from the extension sets
+_PDF_SUFFIXES = tuple(f".{ext}" for ext in sorted(ALLOWED_EXTENSIONS_PDF))
+_EXCEL_SUFFIXES = tuple(f".{ext}" for ext in sorted(ALLOWED_EXTENSIONS_EXCEL))
 
 # Create directories if they don't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(PROCESSED_FOLDER, exist_ok=True)
+os.makedirs(PARSE_CACHE_FOLDER, exist_ok=True)
+os.makedirs(SHEET_CACHE_FOLDER, exist_ok=True)
+os.makedirs(JOBS_FOLDER, exist_ok=True)
 
 # Required columns with CAS Number explicitly included
-COLUMNS = [
+# (a tuple: _COLUMNS_SET and _COLUMN_INDEX below are derived from it once)
+COLUMNS = (
     "Description",
     "CAS Number",
     "Material Name",
@@ -51,37 +119,553 @@ COLUMNS = [
     "LD50 (mg/kg)",
     "LC50",
     "Source of Information"
-]
+)
+
+_COLUMNS_SET = frozenset(COLUMNS)
+# Built once and shared by every DataFrame that uses the COLUMNS schema
+_COLUMN_INDEX = pd.Index(COLUMNS)
+
+# Low-cardinality columns (a handful of distinct values each) stored as category dtype
+CATEGORICAL_COLUMNS = ["Physical state", "Static Hazard", "Source of Information"]
+
+# Placeholder values treated as "no data" when merging rows
+_NDA_SET = frozenset({"", "NDA", "nda", None, "n/a", "N/A"})
+
+# Extracted density values that mean "no value" (compared lowercased)
+_INVALID_VALUES = frozenset({"not measured", "no data available", "not applicable", "not available", "n/a", "nda", ""})
+
+# Regex patterns used by the SDS parser, compiled once at import time
+
+def _compile_linear(pattern, re_pattern=None):
+    """Compile with RE2 (linear-time matching) when installed, otherwise with re.
+
+    Only for patterns RE2 can express: no atomic groups or lookarounds, and
+    flags given inline. re_pattern, if given, is the equivalent pattern to use
+    with re (e.g. with possessive quantifiers, which RE2 has no need for).
+    """
+    if HAVE_RE2:
+        try:
+            return re2.compile(pattern)
+        except re2.error as e:
+            logger.warning(f"RE2 cannot compile {pattern!r}, using re: {str(e)}")
+    return re.compile(re_pattern or pattern)
+
+def _compile_any(patterns):
+    """Compile a family of patterns that is only tested for "does any of them match".
+
+    With RE2 the family becomes one alternation, matched in a single linear scan.
+    CPython's backtracking re is slower on a fused alternation than on the
+    separate searches, so without RE2 each pattern is compiled on its own.
+    Returns a tuple of compiled patterns either way.
+    """
+    if HAVE_RE2:
+        try:
+            return (re2.compile("|".join(f"(?:{p})" for p in patterns)),)
+        except re2.error as e:
+            logger.warning(f"RE2 cannot compile pattern family, using re: {str(e)}")
+    return tuple(re.compile(p) for p in patterns)
+
+_HAS_DIGIT = re.compile(r'\d')
+_NO_VALUE_WORDS = frozenset({'nda', 'n/a', 'not available'})
+_CLEAN_NUMBER_RE = re.compile(r'([\d,]+[.,]?\d*)')
+_CLEAN_COMMA_DEC_RE = re.compile(r'(\d+),(\d+)$')
+
+# CAS Number patterns - handles complete CAS number format, tried in order
+_CAS_PATTERNS = tuple(re.compile(p, re.IGNORECASE | re.MULTILINE) for p in [
+    r"CAS-No\.?(?>\s*[:\-]?\s*[\[\(]?\s*)(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
+    r"CAS\s+No\.?(?>\s*[:\-]?\s*[\[\(]?\s*)(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
+    r"CAS\s+number(?>\s*[:\-]?\s*[\[\(]?\s*)(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
+    r"CAS#?(?>\s*[:\-]?\s*[\[\(]?\s*)(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
+    r"【CAS】(?>\s*[:\-]?\s*[\[\(]?\s*)(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
+    # More flexible pattern for various CAS formats
+    r"(?:CAS|cas)(?:\s*-?\s*(?:No|NUMBER|#))?(?>\s*[:\-]?\s*[\[\(]?\s*)(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
+])
+
+# Pattern for standalone CAS numbers (more restrictive to avoid false positives),
+# tried only when no labelled pattern matches. It scans every digit run in the
+# document, so it goes to RE2 when available; with re the digit groups are
+# possessive, since giving back a digit can never make the following "-" match.
+_CAS_STANDALONE_RE = _compile_linear(
+    r"\b(\d{2,7}-\d{2}-\d)\b",
+    re_pattern=r"\b(\d{2,7}+-\d{2}+-\d)\b"
+)
+
+# The static-hazard families below run against the lowercased text, so they
+# are written in lowercase and compiled without IGNORECASE. Each family has a
+# keyword prefilter: the patterns only run if one of its substrings is present.
+
+# Mentions of static-related topics. Wildcards between tokens are bounded to
+# the same line so a missing second token cannot trigger a full-text backtrack.
+_STATIC_YES_KEYWORDS = ("static", "ground")
+_STATIC_YES = _compile_any([
+    r"static\s+discharge",
+    r"static\s+electricity",
+    r"static\s+charge",
+    r"measures\s+to\s+prevent[^\n]{0,200}?static",
+    r"ground[^\n]{0,200}?bond[^\n]{0,200}?container",
+    r"grounding[^\n]{0,200}?bonding",
+    r"anti[-\s]?static",
+    r"static\s+sensitive",
+    r"electrostatic\s+ignition",
+    r"static\s+buildup"
+])
+
+# Patterns that indicate NO static hazard
+_STATIC_NO_KEYWORDS = ("static",)
+_STATIC_NO = tuple(re.compile(p) for p in [
+    r"no\s+static\s+hazard",
+    r"static\s+hazard(?>\s*:?\s*)no",
+    r"not\s+static\s+sensitive",
+    r"no\s+electrostatic\s+hazard",
+    r"static\s+discharge(?>\s*:?\s*)not\s+applicable",
+    r"static\s+discharge(?>\s*:?\s*)n/?a"
+])
+
+# Handling/storage sections where static info might be expected
+_HANDLING_KEYWORDS = ("handling", "storage")
+_HANDLING_SECTIONS = _compile_any([
+    r"section\s*7[^\n]{0,200}?(?:handling|storage)",
+    r"handling\s+and\s+storage",
+    r"precautions\s+for\s+safe\s+handling",
+    r"storage\s+conditions"
+])
+
+# Enhanced pattern matching for physical state
+_PHYSICAL_STATE_RE = re.compile(r"""(?ix)
+\b
+(
+    Physical\s+state
+  | Appearance\s*:\s*Form
+  | Appearance
+  | Form\s+at\s+room\s+temperature
+    (?:\s*\(\s*\d{1,3}(?:\.\d+)?\s*(?:°\s*C|C|K|Kelvin)?\s*\))?
+)
+\s*[:\-]?\s*
+([^\n\r.]+)
+""")
+
+# Case-sensitive fallback pattern for physical state (lowest priority)
+_PHYSICAL_STATE_FORM_RE = re.compile(r"""
+    \bForm\s*[:\-]?\s*([^\n\r.]+)
+    """)
+
+_VP_RE = re.compile(r"""(?ix)                         # (?i) case-insensitive, (?x) verbose mode
+    vapo[u]?r\s+pressure                           # 'vapor pressure' or 'vapour pressure'
+    (?:\s*\(.*?\))?                                # optional: (mmHg), (Pa), etc.
+    (?:\s+(?:at|@)\s+\d{1,3}\s*(?:degree)?\s*[°]?[Cc])?   # optional: 'at 20 degreeC' or 'at 30 C'
+    \s*[:\-]?\s*                                   # optional: colon, dash
+    (.*)                                           # capture the rest of the line
+""")
+
+_TRADE_RE = re.compile(r"(?i)(?:Product\s*/\s*)?Trade\s*Name(?:\s*&\s*Synonyms)?\s*:?\s*([^\n\r]+)")
+
+_FLASH_RE = re.compile(r"""(?ix)
+\b
+(
+    flash\s+point\s*,\s*°\s*C
+  | flash\s+point\s*\(\s*C\s*\)\s*+method
+  | flash\s+point\s+°\s*C
+  | flash\s+point\s*\(\s*°\s*C\s*\)
+  | flash\s+point\s*&\s*method
+  | flash\s+point
+)
+\s*[:=\s]+\s*
+([^\n\r]+)
+""")
+
+_MELT_RE = re.compile(r"""(?ix)
+\b
+(
+    melting\s+point\s*/\s*freezing\s+point
+    |melting\s+point\s*,\s*°\s*C 
+    |melting\s+point\s*°\s*C
+    | freezing\s*/\s*melting\s+point
+    | freezing\s+point\s*/\s*range
+    | melting\s*/\s*freezing\s+point\s*(?:°\s*C|deg\s*C)?
+    | melting\s+point\s*/\s*melting\s+range
+    | melting\s+point\s*/\s*range
+    | melting\s+point\s*(?:°\s*C|deg\s*C)?
+    | freezing\s+point\s*(?:°\s*C|deg\s*C)?
+)
+\s*:\s*
+([^\n\r]+)
+""")
+
+_BOIL_RE = re.compile(r"""(?ix)
+\b
+(
+    initial\s+boiling\s+point\s*/\s*boiling\s+ranges
+  | initial\s+boiling\s+point\s+and\s+boiling\s+range\s*\(°?\s*C\)?
+  | initial\s+boiling\s+point\s+and\s+boiling\s+range
+  | initial\s+boiling\s+point\s*/\s*boiling\s+range
+  | boiling\s+point\s*/\s*boiling\s+range
+  | boiling\s+point\s*/\s*range
+  | boiling\s+point\s*\(\s*\d+\s*mm\s*hg\s*\)
+  | boiling\s+point\s*,\s*°?\s*C
+  | boiling\s+point\s*\(°?\s*C\s*\)
+  | boiling\s+point\s+°?\s*C
+  | boiling\s+point
+)
+\s*[:=\s]+\s*
+([^\n\r]+)
+""")
+
+# Density patterns
+_DENSITY_COMBINED_RE = re.compile(r"Density\s+and\s+/\s+or\s+relative\s+density\s*[:\-]?\s*(.*)", re.IGNORECASE)
+_DENSITY_RELATIVE_RE = re.compile(r"Relative\s+Density\s*[:\-]?\s*(.*)")
+_DENSITY_RE = re.compile(r"Density\s*[:\-]?\s*(.*)")
+_DENSITY_FALLBACK_RE = re.compile(r"""(?ix)
+    (    
+        Specific\s+gravity\s*\(.*?=\s*1\)
+        |
+        Relative\s+density\s*\(.*?=\s*1\)
+        |
+        Specific\s+gravity(?:\s+density)?
+        |
+        Specific\s+gravity\s*/\s*density
+        |
+        Density\s*/\s*Specific\s+gravity
+        |
+        Relative\s+density\s*+\s+\s+(?:\s+\s+water\s*+\s=+\s*+1+\s)
+        |
+        Density\s+at\s+\d{1,3}\s*(?:°|degree)?\s*[CFK]
+        |
+        Density\s*@\s*\d{1,3}\s*[CFK]
+        |
+        Density\s+at\s+\d{1,3}\s*(?:°|degree)?\s*[CFK]\s*,\s*[gkmg/^\s\d.]+
+        |
+        Specific\s+gravity\s+at\s+\d{1,3}\s*(?:°|degree)?\s*[CFK]
+        |
+        Relative\s+density\s+at\s+\d{1,3}\s*(?:°|degree)?\s*[CFK]
+        
+    )
+    \s*[:\-]?\s*
+    (.*)
+""")
+
+# Density patterns with their value group, in priority order: 'Relative Density',
+# 'Density and/or relative density', plain 'Density', then the fallback labels
+_DENSITY_PATTERNS = (
+    (_DENSITY_RELATIVE_RE, 1),
+    (_DENSITY_COMBINED_RE, 1),
+    (_DENSITY_RE, 1),
+    (_DENSITY_FALLBACK_RE, 2),
+)
 
-def allowed_file(filename, allowed_extensions):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
+_VAPOR_DENSITY_RE = re.compile(r"""(?ix)                             # (?i) case-insensitive, (?x) verbose mode
+    (?:relative\s+)?                                               # optional 'relative'
+    vapo[u]?r\s+density                                            # 'vapor density' or 'vapour density'
+    (?:\s*\(air\s*=\s*1\))?                                        # optional: (air = 1)
+    (?:\s+at\s+\d{1,3}\s*(?:degree)?\s*[°]?\s*C)?                  # optional: at 20 °C or at 30 degree C
+    \s*[:\-]?\s*                                                   # optional colon or dash
+    (.*)                                                           # capture everything after the label
+""")
 
-def extract_pdf_text_fallback(pdf_path):
-    """Extract text from PDF using PyPDF2 as fallback"""
+# LD50 value in mg/kg, in priority order (each searched over the whole section): anywhere
+# later on the "LD50" line, then after an optional oral/dermal qualifier that may end the
+# line, then the same for the subscript "LD₅₀" spelling
+_LD50_PATTERNS = tuple(re.compile(p, re.IGNORECASE | re.MULTILINE) for p in (
+    r"LD50[^\n]{0,200}?([0-9,]+[.,]?\d*)\s*mg/kg",
+    r"LD50(?>\s*:?\s*(?:oral|dermal)?\s*)([\d,]+[.,]?\d*)\s*mg/kg",
+    r"LD₅₀(?>\s*:?\s*(?:oral|dermal)?\s*)([\d,]+[.,]?\d*)\s*mg/kg",
+))
+
+# LC50 value in mg/L or ppm, with optional exposure time
+_LC50_RE = re.compile(
+    r"LC[50₅O]+(?>\s*(?:inhalation)?\s*[:\-]?\s*)([><=]?\s*\d+(?:[.,]\d+)?\s*(?:(?:mg|g)/L|ppm)(?:\s*\((?!.*fish|zebrafish|minnow).*?\))?(?:\s*\d+\s*(?:h|hr))?)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+_CHEM_NAME_RE = re.compile(r"""(?ix)
+\b
+( 
+    Chemical\s+name
+    | Material\s+name
+    | Product\s+names
+    | Product\s+name
+    | Substance\s+name
+    | Product\s+description
+    
+)
+\s*[:\-]?\s+                  # allow colon or dash or just multiple spaces
+([^\n\r]+)                    # capture everything after
+""")
+
+_IGNITION_RE = re.compile(r"""(?ix)
+\b
+(
+  auto[\s-]ignition\s+temp\s*\(\s*°\s*C\s*\)
+  | auto[\s-]*ignition\s+temperature
+  | auto[\s-]*ignition\s+degree\s+C
+  | auto[\s-]*ignition\s+°\s*C
+  | auto[\s-]*ignition
+  | self\s+ignition\s+temperature
+  | ignition\s+temperature\s*,\s*°\s*C
+  | ignition\s+temperature
+)
+\s*[:=\s]+\s*
+([^\n\r]+)
+""")
+
+# Upper explosive limit with label and value
+_UEL_RE = re.compile(r"""(?ix)
+\b(
+    upper\s+(?:explosion|flammability)\s+limit
+    |
+    explosive\s+limit[-\s]*upper
+    |
+    upper\s+explosion\s+limit\s*\(%\s*by\s*volume\)
+    |
+    explosive\s+limit[-\s]*upper\s*\(%\s*\)
+    |
+    UEL\s*\(%\s*by\s*volume\)
+    |
+    \bUEL\b
+    |
+    upper\s+explosive\s+limit
+    |
+    upper\s+flammability\s*/\s*(?:explosion|explosive)\s+limit
+)
+# The value may itself be a "-", so the separator stays outside the atomic groups and
+# can be given back to it (as in "UEL -"); each whitespace run is still matched only once
+(?>\s*)(?:[:\-](?>\s*))?
+([\-\d.,]+%?)
+""")
+
+# Lower explosive limit with label and value
+_LEL_RE = re.compile(r"""(?ix)
+\b(
+    lower\s+(?:explosion|flammability)\s+limit
+    |
+    explosive\s+limit[-\s]*lower
+    |
+    lower\s+explosion\s+limit\s*\(%\s*by\s*volume\)
+    |
+    explosive\s+limit[-\s]*lower\s*\(%\s*\)
+    |
+    LEL\s*\(%\s*by\s*volume\)
+    |
+    \bLEL\b
+    |
+    lower\s+explosive\s+limit
+    |
+    lower\s+flammability\s*/\s*(?:explosion|explosive)\s+limit
+)
+# As in _UEL_RE: the separator can be given back to a "-" value
+(?>\s*)(?:[:\-](?>\s*))?
+([\-\d.,]+%?)
+""")
+
+# One exposure limit (e.g. TWA: 5 mg/m3)
+_TLV_RE = re.compile(r"""(?ix)
+    \b
+    (?:TWA|STEL|TLV|PEL|REL|OEL|MAK|EU-OEL|NIOSH\s+REL|OSHA\s+PEL|ACGIH\s+TLV)
+    (?:(?>\s*[:\-]?\s*)|\s+as\s+)?
+    (\d+\.?\d*)
+    \s*
+    (ppm|mg/m3|mg\/m3)
+    """)
+
+_IDLH_RE = re.compile(r"""(?ix)
+    \b
+    (
+        immediately\s+dangerous\s+to\s+life\s+or\s+health
+        | IDLH
+    )
+    \s*[:=\s]+\s*
+    ([^\n\r]+)
+""")
+
+# Label/value fields: field key -> (pattern, value groups, label keywords, section).
+# A field's pattern can only match if one of its keywords occurs in the
+# lowercased text, so fields missing from a document cost a substring check
+# instead of a full regex scan. The pattern is searched only in the text of
+# SDS section number `section` (as split by _split_sections); a section of
+# None, or one the document has no header for, means the whole text is searched.
+_FIELD_PATTERNS = {
+    "flash": (_FLASH_RE, (2,), ("flash",), 9),
+    "melt": (_MELT_RE, (2,), ("melting", "freezing"), 9),
+    "boil": (_BOIL_RE, (2,), ("boiling",), 9),
+    "vp": (_VP_RE, (1,), ("pressure",), 9),
+    "vapor_density": (_VAPOR_DENSITY_RE, (1,), ("vapo",), 9),
+    "trade": (_TRADE_RE, (1,), ("trade",), 1),
+    "name": (_CHEM_NAME_RE, (2,), ("name", "description"), 1),
+    "ignition": (_IGNITION_RE, (2,), ("ignition",), 9),
+    "uel": (_UEL_RE, (2,), ("upper", "uel"), 9),
+    "lel": (_LEL_RE, (2,), ("lower", "lel"), 9),
+    "tlv": (_TLV_RE, (1, 2), ("twa", "stel", "tlv", "pel", "rel", "oel", "mak"), 8),
+    "idlh": (_IDLH_RE, (2,), ("idlh", "immediately"), 8),
+}
+
+# Numbered SDS section headers ("SECTION 9: Physical and chemical properties")
+_SECTION_HEADER_RE = re.compile(r"(?im)^\s*SECTION\s*(\d{1,2})\b")
+
+def _split_sections(text):
+    """Split SDS text into {section number: section text} using its numbered headers"""
+    starts = []
+    for match in _SECTION_HEADER_RE.finditer(text):
+        number = int(match.group(1))
+        if number == 1 and starts:
+            # Section numbering restarted (e.g. after a table of contents)
+            starts = []
+        if not starts or number > starts[-1][0]:
+            starts.append((number, match.start()))
+    
+    sections = {}
+    for i, (number, start) in enumerate(starts):
+        end = starts[i + 1][1] if i + 1 < len(starts) else len(text)
+        sections[number] = text[start:end]
+    return sections
+
+def _scan_fields(text, text_lower, sections):
+    """Return the value groups of the first match for each label/value field in its SDS section"""
+    found = {}
+    for key, (pattern, groups, keywords, section) in _FIELD_PATTERNS.items():
+        if any(keyword in text_lower for keyword in keywords):
+            match = pattern.search(sections.get(section, text))
+            if match:
+                found[key] = [match.group(group) for group in groups]
+    return found
+
+
+# Sections after Toxicological information (11) are not used by the parser
+_LATE_SECTION_RE = re.compile(r"(?im)^\s*SECTION\s*1[2-6]\b")
+# A "label: value" line (e.g. "Acute toxicity: Oral LD50 ..."); a table of contents
+# only has section titles and page numbers
+_LABEL_LINE_RE = re.compile(r"(?m)^[^\S\n]*[^\W\d_][^:\n]*:[^\S\n]*\S")
+
+def _past_needed_sections(chunks):
+    """True once the page texts so far contain a complete Section 11 followed by a later section"""
+    if not _LATE_SECTION_RE.search(chunks[-1]):
+        return False
+    sections = _split_sections("\n".join(chunks))
+    if not any(number > 11 for number in sections):
+        return False
+    # A table of contents entry (title, page number) is not the real Section 11: that has
+    # label/value lines below its header. Sections restart after a TOC, so the real one
+    # replaces the entry once its pages are read.
+    body = sections.get(11, "").partition("\n")[2]
+    return _LABEL_LINE_RE.search(body) is not None
+
+def allowed_file(filename, suffixes):
+    return filename.lower().endswith(suffixes)
+
+# PyPDF2 text shorter than this is treated as a failed extraction and pdfplumber is tried
+MIN_PYPDF_CHARS = 1024
+
+def _open_pypdf(pdf_path):
+    """PyPDF2 reader for a PDF, or None if PyPDF2 cannot open it"""
     try:
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text
+        return PyPDF2.PdfReader(pdf_path)
+    except Exception as e:
+        logger.error(f"PyPDF2 could not open {pdf_path}: {str(e)}")
+        return None
+
+def extract_pdf_text_fallback(pdf_path, reader=None):
+    """Extract text from PDF using PyPDF2 as fallback; reader, if given, is an already open PdfReader for it"""
+    if reader is None:
+        reader = _open_pypdf(pdf_path)
+        if reader is None:
+            return ""
+    try:
+        chunks = []
+        for page in reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                chunks.append(page_text)
+                if _past_needed_sections(chunks):
+                    break
+        return "\n".join(chunks)
     except Exception as e:
         logger.error(f"PyPDF2 extraction failed for {pdf_path}: {str(e)}")
         return ""
 
+def _extract_page_pypdf(reader, page_number, pdf_path):
+    """Extract a single page with the PDF's PyPDF2 reader; returns "" if that fails too (or reader is None)"""
+    if reader is None:
+        return ""
+    try:
+        pages = reader.pages
+        if page_number < len(pages):
+            return pages[page_number].extract_text() or ""
+    except Exception as e:
+        logger.warning(f"PyPDF2 failed on page {page_number + 1} of {pdf_path}: {str(e)}")
+    return ""
+
 def extract_pdf_text(pdf_path):
     """Extract text from PDF file with fallback methods"""
     text = ""
     
-    # Try pdfplumber first
+    # Try PyMuPDF first
     try:
+        doc = fitz.open(pdf_path)
+        try:
+            chunks = []
+            for page in doc:
+                chunks.append(page.get_text("text"))
+                if _past_needed_sections(chunks):
+                    break
+            text = "\n".join(chunks)
+            # A PDF without a single font has no text layer (e.g. a scan), so the
+            # other extractors cannot find any text in it either
+            image_only = not text.strip() and not any(page.get_fonts() for page in doc)
+        finally:
+            doc.close()
+        
+        if text.strip():
+            logger.info(f"Successfully extracted text using PyMuPDF from {os.path.basename(pdf_path)}")
+            return text
+        if image_only:
+            logger.error(f"No text layer in {pdf_path}, skipping the other extraction methods")
+            return ""
+    except Exception as e:
+        logger.warning(f"PyMuPDF failed for {pdf_path}: {str(e)}")
+    
+    # Fallback to Poppler's pdftotext when installed (native, much faster than pdfplumber)
+    if HAVE_PDFTOTEXT:
+        try:
+            chunks = []
+            with open(pdf_path, 'rb') as f:
+                for page_text in pdftotext.PDF(f):
+                    chunks.append(page_text)
+                    if _past_needed_sections(chunks):
+                        break
+            text = "\n".join(chunks)
+            
+            if text.strip():
+                logger.info(f"Successfully extracted text using pdftotext from {os.path.basename(pdf_path)}")
+                return text
+        except Exception as e:
+            logger.warning(f"pdftotext failed for {pdf_path}: {str(e)}")
+    
+    # Fallback to PyPDF2: faster than pdfplumber on text-native PDFs, but it returns little
+    # or nothing for unusual encodings, so short results still go on to pdfplumber.
+    # The reader is opened once here and reused for pdfplumber's per-page retries.
+    pypdf_reader = _open_pypdf(pdf_path)
+    pypdf_text = extract_pdf_text_fallback(pdf_path, pypdf_reader) if pypdf_reader is not None else ""
+    if len(pypdf_text.strip()) >= MIN_PYPDF_CHARS:
+        logger.info(f"Successfully extracted text using PyPDF2 from {os.path.basename(pdf_path)}")
+        return pypdf_text
+    
+    # Fallback to pdfplumber
+    text = ""
+    try:
+        chunks = []
         with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
+            for page_number, page in enumerate(pdf.pages):
+                try:
+                    page_text = page.extract_text(x_tolerance=3, y_tolerance=3, layout=False, keep_blank_chars=False)
+                except Exception as e:
+                    logger.warning(f"pdfplumber failed on page {page_number + 1} of {pdf_path}: {str(e)}")
+                    page_text = None
+                if not page_text:
+                    # Retry just this page with PyPDF2
+                    page_text = _extract_page_pypdf(pypdf_reader, page_number, pdf_path)
                 if page_text:
-                    text += page_text + "\n"
+                    chunks.append(page_text)
+                    if _past_needed_sections(chunks):
+                        break
+        text = "\n".join(chunks)
         
         if text.strip():
             logger.info(f"Successfully extracted text using pdfplumber from {os.path.basename(pdf_path)}")
@@ -89,31 +673,24 @@ def extract_pdf_text(pdf_path):
     except Exception as e:
         logger.warning(f"pdfplumber failed for {pdf_path}: {str(e)}")
     
-    # Fallback to PyPDF2
-    text = extract_pdf_text_fallback(pdf_path)
-    if text.strip():
+    # Whatever little PyPDF2 found is better than nothing
+    if pypdf_text.strip():
         logger.info(f"Successfully extracted text using PyPDF2 from {os.path.basename(pdf_path)}")
-        return text
+        return pypdf_text
     
     logger.error(f"All text extraction methods failed for {pdf_path}")
     return ""
 
 def clean_numeric_value(value_str):
     """Clean and standardize numeric values"""
-    if not value_str or value_str.lower() in ['nda', 'n/a', 'not available']:
+    if not value_str or value_str.lower() in _NO_VALUE_WORDS:
         return "NDA"
     
-    # Remove extra whitespace and common prefixes
-    value_str = value_str.strip()
-    value_str = re.sub(r'^[:\-\s]+', '', value_str)
-    
-    # Extract first number found
-    number_match = re.search(r'([\d,]+[.,]?\d*)', value_str)
+    # Extract first number found (leading ":", "-" and whitespace can never be part of it)
+    number_match = _CLEAN_NUMBER_RE.search(value_str)
     if number_match:
-        number = number_match.group(1)
         # Convert comma decimal separator to dot
-        number = re.sub(r'(\d+),(\d+)$', r'\1.\2', number)
-        return number
+        return _CLEAN_COMMA_DEC_RE.sub(r'\1.\2', number_match.group(1))
     
     return "NDA"
 
@@ -127,11 +704,11 @@ def parse_sds_data(text, source_filename):
     logger.debug(f"Text length: {len(text)} characters")
     logger.debug(f"First 500 chars: {text[:500]}")
     
-    def find_between(pattern, default="NDA", field_name=""):
-        matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-        if matches:
-            result = matches[0].strip() if isinstance(matches[0], str) else str(matches[0]).strip()
-            result = clean_numeric_value(result) if any(char.isdigit() for char in result) else result
+    def find_between(compiled, default="NDA", field_name="", source=text):
+        match = compiled.search(source)
+        if match:
+            result = (match.group(1) if compiled.groups else match.group(0)).strip()
+            result = clean_numeric_value(result) if _HAS_DIGIT.search(result) else result
             logger.debug(f"Found {field_name}: {result}")
             return result
         logger.debug(f"No match found for {field_name}")
@@ -140,82 +717,47 @@ def parse_sds_data(text, source_filename):
     # Fixed CAS Number extraction - handles complete CAS number format
     def extract_cas_number(text):
         """Extract CAS number without applying numeric cleaning"""
-        cas_patterns = [
-            r"CAS-No\.?\s*[:\-]?\s*[\[\(]?\s*(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
-            r"CAS\s+No\.?\s*[:\-]?\s*[\[\(]?\s*(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
-            r"CAS\s+number\s*[:\-]?\s*[\[\(]?\s*(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
-            r"CAS#?\s*[:\-]?\s*[\[\(]?\s*(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
-            r"【CAS】\s*[:\-]?\s*[\[\(]?\s*(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
-            # More flexible pattern for various CAS formats
-            r"(?:CAS|cas)(?:\s*-?\s*(?:No|NUMBER|#))?\s*[:\-]?\s*[\[\(]?\s*(\d{2,7}-\d{2}-\d)\s*[\]\)]?",
-            # Pattern for standalone CAS numbers (more restrictive to avoid false positives)
-            r"\b(\d{2,7}-\d{2}-\d)\b"
-        ]
+        for pattern in _CAS_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                cas_result = match.group(1).strip()
+                logger.debug(f"Found CAS Number with pattern '{pattern.pattern}': {cas_result}")
+                return cas_result
         
-        for pattern in cas_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                cas_result = matches[0].strip()
-                logger.debug(f"Found CAS Number with pattern '{pattern}': {cas_result}")
+        # A standalone CAS number needs hyphens
+        if "-" in text:
+            match = _CAS_STANDALONE_RE.search(text)
+            if match:
+                cas_result = match.group(1).strip()
+                logger.debug(f"Found standalone CAS Number: {cas_result}")
                 return cas_result
         
         logger.debug("No CAS Number found")
         return "NDA"
     
-    def extract_static_hazard(text):
+    def extract_static_hazard(text_lower):
         """Extract static hazard information - return Yes/No/NDA based on static discharge mentions"""
-        # First check if there's any mention of static-related topics at all
-        static_patterns = [
-            r"static\s+discharge",
-            r"electrostatic\s+discharge",
-            r"static\s+electricity",
-            r"electrostatic\s+charge",
-            r"static\s+charge",
-            r"precautionary\s+measures\s+against\s+static\s+discharge",
-            r"measures\s+to\s+prevent.*static",
-            r"ground.*bond.*container",
-            r"grounding.*bonding",
-            r"anti[-\s]?static",
-            r"static\s+sensitive",
-            r"electrostatic\s+ignition",
-            r"static\s+buildup"
-        ]
-        
-        # Patterns that indicate NO static hazard
-        no_static_patterns = [
-            r"no\s+static\s+hazard",
-            r"static\s+hazard\s*:?\s*no",
-            r"not\s+static\s+sensitive",
-            r"no\s+electrostatic\s+hazard",
-            r"static\s+discharge\s*:?\s*not\s+applicable",
-            r"static\s+discharge\s*:?\s*n/?a"
-        ]
-        
         # Check for explicit "No" indicators first
-        for pattern in no_static_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                logger.debug(f"Found explicit no static hazard indicator: {pattern}")
-                return "No"
+        if any(keyword in text_lower for keyword in _STATIC_NO_KEYWORDS):
+            for pattern in _STATIC_NO:
+                if pattern.search(text_lower):
+                    logger.debug(f"Found explicit no static hazard indicator: {pattern.pattern}")
+                    return "No"
         
         # Check for "Yes" indicators
-        for pattern in static_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                logger.debug(f"Found static hazard indicator: {pattern}")
-                return "Yes"
+        if any(keyword in text_lower for keyword in _STATIC_YES_KEYWORDS):
+            for pattern in _STATIC_YES:
+                if pattern.search(text_lower):
+                    logger.debug(f"Found static hazard indicator: {pattern.pattern}")
+                    return "Yes"
         
         # Check if there's any mention of handling/storage sections where static info might be expected
-        handling_sections = [
-            r"SECTION\s*7.*?(?:handling|storage)",
-            r"handling\s+and\s+storage",
-            r"precautions\s+for\s+safe\s+handling",
-            r"storage\s+conditions"
-        ]
-        
         has_handling_section = False
-        for pattern in handling_sections:
-            if re.search(pattern, text, re.IGNORECASE):
-                has_handling_section = True
-                break
+        if any(keyword in text_lower for keyword in _HANDLING_KEYWORDS):
+            for pattern in _HANDLING_SECTIONS:
+                if pattern.search(text_lower):
+                    has_handling_section = True
+                    break
         
         if has_handling_section:
             # If there's a handling section but no static hazard info, assume "No"
@@ -233,54 +775,34 @@ def parse_sds_data(text, source_filename):
     # Use PDF filename as description (remove .pdf extension)
     desc = os.path.splitext(source_filename)[0]
     
-    # Enhanced pattern matching for various properties
-    pattern_case_insensitive = r"""(?ix)
-    \b
-    (
-        Physical\s+state
-      | Appearance\s*:\s*Form
-      | Appearance
-      | Form\s+at\s+room\s+temperature
-        (?:\s*\(\s*\d{1,3}(?:\.\d+)?\s*(?:°\s*C|C|K|Kelvin)?\s*\))?
-    )
-    \s*[:\-]?\s*
-    ([^\n\r.]+)
-    """
-    
-    # 2️⃣ Case-sensitive fallback pattern (lowest priority)
-    pattern_case_sensitive = r"""
-    \bForm\s*[:\-]?\s*([^\n\r.]+)
-    """
+    # Label/value fields, each searched only within its own SDS section
+    # (falling back to the full text when the section header is missing)
+    text_lower = text.lower()
+    sections = _split_sections(text)
+    properties_text = sections.get(9, text)
+    toxicology_text = sections.get(11, text)
+    fields = _scan_fields(text, text_lower, sections)
     
     physical_state = "NDA"
     
     # First, try the high-priority case-insensitive patterns
-    match = re.search(pattern_case_insensitive, text)
+    match = _PHYSICAL_STATE_RE.search(properties_text)
     if match:
         physical_state = match.group(2).strip()
     else:
         # Fallback: case-sensitive "Form"
-        match = re.search(pattern_case_sensitive, text)
+        match = _PHYSICAL_STATE_FORM_RE.search(properties_text)
         if match:
             physical_state = match.group(1).strip()
         
     
-    static_hazard = extract_static_hazard(text)
+    static_hazard = extract_static_hazard(text_lower)
 
 
     vapour_pressure = "NDA"
     
-    vp_pattern = r"""(?ix)                             # (?i) case-insensitive, (?x) verbose mode
-        vapo[u]?r\s+pressure                           # 'vapor pressure' or 'vapour pressure'
-        (?:\s*\(.*?\))?                                # optional: (mmHg), (Pa), etc.
-        (?:\s+(?:at|@)\s+\d{1,3}\s*(?:degree)?\s*[°]?[Cc])?   # optional: 'at 20 degreeC' or 'at 30 C'
-        \s*[:\-]?\s*                                   # optional: colon, dash
-        (.*)                                           # capture the rest of the line
-    """
-    
-    match = re.search(vp_pattern, text)
-    if match:
-        vapour_pressure = match.group(1).strip()
+    if "vp" in fields:
+        vapour_pressure = fields["vp"][0].strip()
 
 
     
@@ -292,347 +814,106 @@ def parse_sds_data(text, source_filename):
     # Extract other properties with multiple patterns
 
     
-    trade_pattern = r"(?i)(?:Product\s*/\s*)?Trade\s*Name(?:\s*&\s*Synonyms)?\s*:?\s*([^\n\r]+)"
-    m = re.search(trade_pattern, text)
-    
-    if m:
-        trade_name = m.group(1).strip()
+    if "trade" in fields:
+        trade_name = fields["trade"][0].strip()
     else:
         trade_name = "NDA"
 
 
-    flash_pattern = r"""(?ix)
-    \b
-    (
-        flash\s+point\s*,\s*°\s*C
-      | flash\s+point\s*\(\s*C\s*\)\s*+method
-      | flash\s+point\s+°\s*C
-      | flash\s+point\s*\(\s*°\s*C\s*\)
-      | flash\s+point\s*&\s*method
-      | flash\s+point
-    )
-    \s*[:=\s]+\s*
-    ([^\n\r]+)
-    """
-    
     flash_point = "NDA"
     
-    match = re.search(flash_pattern, text)
-    if match:
-        flash_point = match.group(2).strip()
+    if "flash" in fields:
+        flash_point = fields["flash"][0].strip()
 
 
     
-    melt_pattern = r"""(?ix)
-    \b
-    (
-        melting\s+point\s*/\s*freezing\s+point
-        |melting\s+point\s*,\s*°\s*C 
-        |melting\s+point\s*°\s*C
-        | freezing\s*/\s*melting\s+point
-        | freezing\s+point\s*/\s*range
-        | melting\s*/\s*freezing\s+point\s*(?:°\s*C|deg\s*C)?
-        | melting\s+point\s*/\s*melting\s+range
-        | melting\s+point\s*/\s*range
-        | melting\s+point\s*(?:°\s*C|deg\s*C)?
-        | freezing\s+point\s*(?:°\s*C|deg\s*C)?
-        | melting\s+point
-        | freezing\s+point
-    )
-    \s*:\s*
-    ([^\n\r]+)
-    """
-    
     melting_point = "NDA"
     
-    match = re.search(melt_pattern, text)
-    if match:
-        melting_point = match.group(2).strip()
+    if "melt" in fields:
+        melting_point = fields["melt"][0].strip()
 
 
     
-    boil_pattern = r"""(?ix)
-    \b
-    (
-        initial\s+boiling\s+point\s*/\s*boiling\s+ranges
-      | initial\s+boiling\s+point\s+and\s+boiling\s+range\s*\(°?\s*C\)?
-      | initial\s+boiling\s+point\s+and\s+boiling\s+range
-      | initial\s+boiling\s+point\s*/\s*boiling\s+range
-      | boiling\s+point\s*/\s*boiling\s+range
-      | boiling\s+point\s*/\s*range
-      | boiling\s+point\s*\(\s*\d+\s*mm\s*hg\s*\)
-      | boiling\s+point\s*,\s*°?\s*C
-      | boiling\s+point\s*\(°?\s*C\s*\)
-      | boiling\s+point\s+°?\s*C
-      | boiling\s+point
-    )
-    \s*[:=\s]+\s*
-    ([^\n\r]+)
-    """
-    
     boiling_point = "NDA"
     
-    match = re.search(boil_pattern, text)
-    if match:
-        boiling_point = match.group(2).strip()
+    if "boil" in fields:
+        boiling_point = fields["boil"][0].strip()
     
+    # First usable value in _DENSITY_PATTERNS priority order
     density = "NDA"
-    
-    # Define values to ignore
-    invalid_values = ["not measured", "no data available", "Not applicable", "No data available", "not applicable","not available"]
-
-    match = re.search(r"Density\s+and\s+/\s+or\s+relative\s+density\s*[:\-]?\s*(.*)", text, re.IGNORECASE)
-    if match:
-        value = match.group(1).strip()
-        if value.lower() not in invalid_values:
-            density = value
-    
-    # Priority 1: Try 'Relative Density' (case-insensitive)
-    match = re.search(r"Relative\s+Density\s*[:\-]?\s*(.*)", text)
-    if match:
-        value = match.group(1).strip()
-        if value.lower() not in invalid_values:
-            density = value
-    
-    # Priority 2: Try 'Density' (case-insensitive)
-    if density == "NDA":
-        match = re.search(r"Density\s*[:\-]?\s*(.*)", text)
-        if match:
-            value = match.group(1).strip()
-            if value.lower() not in invalid_values:
-                density = value
-    
-    # Priority 3: Fallbacks (case-insensitive with multiple patterns)
-    if density == "NDA":
-        fallback_pattern = r"""(?ix)
-            (    
-                Specific\s+gravity\s*\(.*?=\s*1\)
-                |
-                Relative\s+density\s*\(.*?=\s*1\)
-                |
-                Specific\s+gravity(?:\s+density)?
-                |
-                Specific\s+gravity\s*/\s*density
-                |
-                Density\s*/\s*Specific\s+gravity
-                |
-                Relative\s+density\s*+\s+\s+(\s+\s+water\s*+\s=+\s*+1+\s)
-                |
-                Density\s+at\s+\d{1,3}\s*(?:°|degree)?\s*[CFK]
-                |
-                Density\s*@\s*\d{1,3}\s*[CFK]
-                |
-                Density\s+at\s+\d{1,3}\s*(?:°|degree)?\s*[CFK]\s*,\s*[gkmg/^\s\d.]+
-                |
-                Specific\s+gravity\s+at\s+\d{1,3}\s*(?:°|degree)?\s*[CFK]
-                |
-                Relative\s+density\s+at\s+\d{1,3}\s*(?:°|degree)?\s*[CFK]
-                
-            )
-            \s*[:\-]?\s*
-            (.*)
-        """
-        match = re.search(fallback_pattern, text)
+    for pattern, group in _DENSITY_PATTERNS:
+        match = pattern.search(properties_text)
         if match:
-            value = match.group(2).strip()
-            if value.lower() not in invalid_values:
+            value = match.group(group).strip()
+            if value.lower() not in _INVALID_VALUES:
                 density = value
+                break
     
 
     # vapor density
     vapor_density = "NDA"
-
-    vapor_density_pattern = r"""(?ix)                                 # (?i) case-insensitive, (?x) verbose mode
-        (?:relative\s+)?                                               # optional 'relative'
-        vapo[u]?r\s+density                                            # 'vapor density' or 'vapour density'
-        (?:\s*\(air\s*=\s*1\))?                                        # optional: (air = 1)
-        (?:\s+at\s+\d{1,3}\s*(?:degree)?\s*[°]?\s*C)?                  # optional: at 20 °C or at 30 degree C
-        \s*[:\-]?\s*                                                   # optional colon or dash
-        (.*)                                                           # capture everything after the label
-    """
     
-    match = re.search(vapor_density_pattern, text)
-    if match:
-        vapor_density = match.group(1).strip()
+    if "vapor_density" in fields:
+        vapor_density = fields["vapor_density"][0].strip()
 
     
    
 
-    # LD50 extraction
-    ld50_patterns = [
-        r"LD50.*?([0-9,]+[.,]?\d*)\s*mg/kg",
-        r"LD50\s*:?\s*([\d,]+[.,]?\d*)\s*mg/kg",
-        r"LD50\s*:?\s*(?:oral|dermal)?\s*([\d,]+[.,]?\d*)\s*mg/kg",
-        r"LD₅₀\s*:?\s*(?:oral|dermal)?\s*([\d,]+[.,]?\d*)\s*mg/kg"
-    ]
+    # LD50 extraction - skip the pattern scans when no LD/LC label is present
     ld50 = "NDA"
-    for pattern in ld50_patterns:
-        ld50 = find_between(pattern, "NDA", "LD50")
-        if ld50 != "NDA":
-            break
+    if "ld" in text_lower:
+        for pattern in _LD50_PATTERNS:
+            ld50 = find_between(pattern, "NDA", "LD50", toxicology_text)
+            if ld50 != "NDA":
+                break
 
     
-    lc50_patterns = [
-        r"LC[50₅O]+\s*(?:inhalation)?\s*[:\-]?\s*([><=]?\s*\d+(?:[.,]\d+)?\s*(?:mg|g)/L(?:\s*\((?!.*fish|zebrafish|minnow).*?\))?(?:\s*\d+\s*(?:h|hr))?)",
-        r"LC[50₅O]+\s*(?:inhalation)?\s*[:\-]?\s*([><=]?\s*\d+(?:[.,]\d+)?\s*ppm(?:\s*\((?!.*fish|zebrafish|minnow).*?\))?(?:\s*\d+\s*(?:h|hr))?)"
-    ]
-    
     lc50 = "NDA"
-    for pattern in lc50_patterns:
-        lc50 = find_between(pattern, "NDA", "LC50")
-        if lc50 != "NDA":
-            break
+    if "lc" in text_lower:
+        lc50 = find_between(_LC50_RE, "NDA", "LC50", toxicology_text)
 
                 
-    name_pattern = r"""(?ix)
-    \b
-    ( 
-        Chemical\s+name
-        | Material\s+name
-        | Product\s+names
-        | Product\s+name
-        | Substance\s+name
-        | Product\s+description
-        
-    )
-    \s*[:\-]?\s+                  # allow colon or dash or just multiple spaces
-    ([^\n\r]+)                    # capture everything after
-    """
-    
     chemical_name = "NDA"
     
-    match = re.search(name_pattern, text)
-    if match:
-        chemical_name = match.group(2).strip()
+    if "name" in fields:
+        chemical_name = fields["name"][0].strip()
     
         
-    igni_pattern = r"""(?ix)
-    \b
-    (
-      auto[\s-]ignition\s+temp\s*\(\s*°\s*C\s*\)
-      | auto[\s-]*ignition\s+temperature
-      | auto[\s-]*ignition\s+degree\s+C
-      | auto[\s-]*ignition\s+°\s*C
-      | auto[\s-]*ignition
-      | autoignition\s+temperature
-      | self\s+ignition\s+temperature
-      | ignition\s+temperature\s*,\s*°\s*C
-      | ignition\s+temperature
-    )
-    \s*[:=\s]+\s*
-    ([^\n\r]+)
-    """
-    
     ignition_temp = "NDA"
     
-    match = re.search(igni_pattern, text)
-    if match:
-        ignition_temp = match.group(2).strip()
+    if "ignition" in fields:
+        ignition_temp = fields["ignition"][0].strip()
 
 
 
-    # Refined regex pattern to extract UEL with label and value
-    uel_pattern = r"""(?ix)
-    \b(
-        upper\s+(?:explosion|flammability)\s+limit
-        |
-        explosive\s+limit[-\s]*upper
-        |
-        upper\s+explosion\s+limit\s*\(%\s*by\s*volume\)
-        |
-        explosive\s+limit[-\s]*upper\s*\(%\s*\)
-        |
-        upper\s+explosion\s+limit
-        |
-        UEL\s*\(%\s*by\s*volume\)
-        |
-        \bUEL\b
-        |
-        upper\s+explosive\s+limit
-        |
-        upper\s+flammability\s*/\s*(?:explosion|explosive)\s+limit
-    )
-    \s*[:\-]?\s*
-    ([\-\d.,]+%?)
-    """
-    
     # Default UEL value
     uel = "NDA"
     
-    # Search for the first match based on priority
-    match = re.search(uel_pattern, text)
-    if match:
-        uel = match.group(2)
+    # First match based on priority
+    if "uel" in fields:
+        uel = fields["uel"][0]
 
 
-    # Refined regex pattern to extract UEL with label and value
-    lel_pattern = r"""(?ix)
-    \b(
-        lower\s+(?:explosion|flammability)\s+limit
-        |
-        explosive\s+limit[-\s]*lower
-        |
-        lower\s+explosion\s+limit\s*\(%\s*by\s*volume\)
-        |
-        explosive\s+limit[-\s]*lower\s*\(%\s*\)
-        |
-        lower\s+explosion\s+limit
-        |
-        LEL\s*\(%\s*by\s*volume\)
-        |
-        \bLEL\b
-        |
-        lower\s+explosive\s+limit
-        |
-        lower\s+flammability\s*/\s*(?:explosion|explosive)\s+limit
-    )
-    \s*[:\-]?\s*
-    ([\-\d.,]+%?)
-    """
-    
-    # Default UEL value
+    # Default LEL value
     lel = "NDA"
     
-    # Search for the first match based on priority
-    match = re.search(lel_pattern, text)
-    if match:
-        lel = match.group(2)
+    # First match based on priority
+    if "lel" in fields:
+        lel = fields["lel"][0]
 
 
-    # Regex pattern to match one exposure limit (e.g. TWA: 5 mg/m3)
-    tlv_pattern = r"""(?ix)
-        \b
-        (?:TWA|STEL|TLV|PEL|REL|OEL|MAK|EU-OEL|NIOSH\s+REL|OSHA\s+PEL|ACGIH\s+TLV)
-        (?:\s*[:\-]?\s*|\s+as\s+)?
-        (\d+\.?\d*)
-        \s*
-        (ppm|mg/m3|mg\/m3)
-        """
-    
     # Default value if nothing is found
     tlv = "NDA"
     
-    # Search for the first match
-    match = re.search(tlv_pattern, text)
-    if match:
-        tlv = f"{match.group(1)} {match.group(2)}"
+    # First match
+    if "tlv" in fields:
+        tlv = " ".join(fields["tlv"])
 
 
-    idlh_pattern = r"""(?ix)
-        \b
-        (
-            immediately\s+dangerous\s+to\s+life\s+or\s+health
-            | IDLH
-        )
-        \s*[:=\s]+\s*
-        ([^\n\r]+)
-    """
-    
     idlh = "NDA"
     
-    match = re.search(idlh_pattern, text)
-    if match:
-        idlh = match.group(2).strip()
+    if "idlh" in fields:
+        idlh = fields["idlh"][0].strip()
 
     
     
@@ -667,38 +948,225 @@ def parse_sds_data(text, source_filename):
     
     return extracted_data
 
+def _process_one_pdf(pdf_path):
+    """Extract and parse a single PDF; runs in a worker process"""
+    filename = os.path.basename(pdf_path)
+    try:
+        logger.info(f"Processing {filename}...")
+        text = extract_pdf_text(pdf_path)
+        
+        if not text.strip():
+            logger.warning(f"No text extracted from {filename}")
+            return filename, None, "no text extracted"
+        
+        parsed_data = parse_sds_data(text, filename)
+        logger.info(f"Successfully processed {filename}")
+        return filename, parsed_data, None
+    except Exception as e:
+        logger.error(f"Error processing {filename}: {str(e)}")
+        return filename, None, f"processing error: {str(e)}"
+
+# Processes used to extract and parse uploaded PDFs (per upload)
+PDF_WORKERS = max(1, int(os.environ.get('PDF_WORKERS', min(os.cpu_count() or 1, 4))))
+# PDF_POOL=thread parses in threads instead, for hosts that cannot start child processes
+# (e.g. Celery prefork workers, which are daemonic); parsing then shares one GIL
+PDF_POOL = os.environ.get('PDF_POOL', 'process').lower()
+PDF_EXECUTOR = ThreadPoolExecutor if PDF_POOL == 'thread' else ProcessPoolExecutor
+
+# Copy size for writing uploads to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Uploaded files larger than this are spooled to disk while the request body is parsed
+UPLOAD_SPOOL_LIMIT = 500 * 1024
+
+class UploadRequest(Request):
+    """Request that spools large uploaded files to named files in UPLOAD_FOLDER
+
+    Werkzeug's default spool file has no name, so it can only be copied. A named
+    spool file on the same filesystem can be hard-linked into the session folder.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is None or total_content_length > UPLOAD_SPOOL_LIMIT:
+            return tempfile.NamedTemporaryFile(dir=UPLOAD_FOLDER, suffix='.part')
+        return io.BytesIO()
+
+app.request_class = UploadRequest
+
+def _save_upload(file_storage, path):
+    """Stream an uploaded file to disk in large chunks; returns the SHA-256 of its bytes"""
+    digest = hashlib.sha256()
+    stream = file_storage.stream
+    spool_path = getattr(stream, 'name', None)
+    if isinstance(spool_path, str):
+        # Already on disk: link the spool file into place instead of copying it
+        try:
+            stream.flush()
+            os.link(spool_path, path)
+        except OSError as e:
+            logger.info(f"Could not link {spool_path}, copying it instead: {str(e)}")
+        else:
+            for chunk in iter(lambda: stream.read(UPLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+            return digest.hexdigest()
+    with open(path, 'wb') as out:
+        while True:
+            chunk = file_storage.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+def _touch_cache_entry(path):
+    """Mark a cache entry as just used, so cleanup (which goes by ctime) keeps it; returns False if it is gone"""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.info(f"Could not refresh cache entry {os.path.basename(path)}: {str(e)}")
+        return True
+
+def _load_cached_parse(sha):
+    """Return the cached parse result for a PDF hash, or None"""
+    cache_path = os.path.join(PARSE_CACHE_FOLDER, f"{sha}.v{PARSE_CACHE_VERSION}.json")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            parsed_data = json.load(f)
+        _touch_cache_entry(cache_path)
+        return parsed_data
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable parse cache entry {sha}: {str(e)}")
+        return None
+
+def _store_cached_parse(sha, parsed_data):
+    """Write a parse result to the cache; written to a temp file and renamed into place"""
+    cache_path = os.path.join(PARSE_CACHE_FOLDER, f"{sha}.v{PARSE_CACHE_VERSION}.json")
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(parsed_data, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write parse cache entry {sha}: {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _file_sha256(path):
+    """SHA-256 of a file on disk, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _load_cached_sheet(sha):
+    """Return the normalised sheet previously stored for an xlsx hash, or None"""
+    cache_path = os.path.join(SHEET_CACHE_FOLDER, sha + ".feather")
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        df = pd.read_feather(cache_path)
+        _touch_cache_entry(cache_path)
+        return df
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable sheet cache entry {sha}: {str(e)}")
+        return None
+
+def _store_cached_sheet(sha, df):
+    """Store a normalised sheet as Feather (Arrow IPC); skipped if the columns can't be stored (e.g. mixed types)"""
+    cache_path = os.path.join(SHEET_CACHE_FOLDER, sha + ".feather")
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        df.reset_index(drop=True).to_feather(tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.info(f"Not caching sheet {sha}: {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _mark_server_output(sha):
+    """Remember that the workbook with this hash was written by write_sds_workbook here"""
+    try:
+        open(os.path.join(SHEET_CACHE_FOLDER, sha + ".output"), 'w').close()
+    except OSError as e:
+        logger.info(f"Not marking output {sha}: {str(e)}")
+
+def _is_server_output(sha):
+    """True if the workbook with this hash is an output this server wrote"""
+    return _touch_cache_entry(os.path.join(SHEET_CACHE_FOLDER, sha + ".output"))
+
 def merge_by_cas_number_optional(rows, merge_duplicates=False):
     """
-    Optionally group SDS entries by CAS number and merge each group into a single row.
+    Build the new-entries DataFrame, optionally grouping SDS entries by CAS number
+    and merging each group into a single row (first non-NDA value per column).
     If merge_duplicates is False, returns all rows without merging.
     """
-    if not rows:
-        return []
-    
-    if not merge_duplicates:
-        logger.info(f"Keeping all {len(rows)} entries without merging")
-        return rows
-    
-    merged = {}
-    
-    for row in rows:
-        cas_key = row.get("CAS Number", "").strip()
-        if cas_key.lower() in ["nda", "", "n/a"]:
-            # For entries without CAS numbers, use description as key to avoid merging
-            cas_key = f"no_cas_{row.get('Description', 'unknown')}_{len(merged)}"
-        
-        if cas_key not in merged:
-            merged[cas_key] = row.copy()
-        else:
-            # Merge data, preferring non-NDA values
-            for col in COLUMNS:
-                current = merged[cas_key].get(col, "NDA")
-                new = row.get(col, "NDA")
-                if current in ["", "NDA", None, "n/a"] and new not in ["", "NDA", None, "n/a"]:
-                    merged[cas_key][col] = new
+    # parse_sds_data always fills every column
+    df = pd.DataFrame(rows, columns=_COLUMN_INDEX)
+    
+    if not merge_duplicates or df.empty:
+        logger.info(f"Keeping all {len(df)} entries without merging")
+        return df
+    
+    cas_keys = df["CAS Number"].fillna("").astype(str).str.strip()
+    # Entries without CAS numbers get a unique key each so they are never merged
+    no_cas = cas_keys.str.lower().isin(_NDA_SET)
+    cas_keys = cas_keys.where(~no_cas, "no_cas_" + df.index.astype(str))
+    
+    # Nothing to merge when every key is unique (the usual case)
+    if not cas_keys.duplicated().any():
+        logger.info(f"No duplicate CAS numbers among {len(df)} entries")
+        return df
+    
+    # First non-NDA value per column and group (NDA placeholders masked to missing so
+    # GroupBy.first skips them); columns that are NDA throughout the group keep the
+    # group's first row value
+    first_rows = ~cas_keys.duplicated()
+    group_first = df.loc[first_rows].set_axis(cas_keys[first_rows])
+    merged = (
+        df.mask(df.isin(list(_NDA_SET)))
+        .groupby(cas_keys, sort=False)
+        .first()
+        .fillna(group_first)
+        .reset_index(drop=True)
+    )
     
-    logger.info(f"Merged {len(rows)} entries into {len(merged)} unique entries")
-    return list(merged.values())
+    logger.info(f"Merged {len(df)} entries into {len(merged)} unique entries")
+    return merged
+
+def _categorize(df):
+    """Convert the low-cardinality columns to category dtype"""
+    return df.astype({col: "category" for col in CATEGORICAL_COLUMNS})
+
+def _concat_sheets(frames):
+    """Concatenate categorized sheet frames, keeping the categorical columns categorical.
+
+    concat falls back to object for category columns whose categories differ,
+    so every frame is first given the union of the categories (a code remap).
+    """
+    dtypes = {
+        col: pd.CategoricalDtype(functools.reduce(pd.Index.union, (frame[col].cat.categories for frame in frames)))
+        for col in CATEGORICAL_COLUMNS
+    }
+    return pd.concat([frame.astype(dtypes) for frame in frames], ignore_index=True)
+
+# Columns compared by each duplicate check mode; a new row is kept only if its
+# normalised value in every listed column is absent from the existing sheet
+_DUPLICATE_KEYS = {
+    "none": (),
+    "cas": ("CAS Number",),
+    "description": ("Description",),
+    "both": ("CAS Number", "Description"),
+}
 
 def check_for_duplicates(existing_df, new_data_df, duplicate_check_mode="description"):
     """
@@ -710,45 +1178,65 @@ def check_for_duplicates(existing_df, new_data_df, duplicate_check_mode="descrip
     - "description": Check by description (filename) only  
     - "both": Check by both CAS number and description
     """
-    if duplicate_check_mode == "none":
-        return new_data_df
-    
-    if len(existing_df) == 0:
+    keys = _DUPLICATE_KEYS.get(duplicate_check_mode, ())
+    if not keys or len(existing_df) == 0 or len(new_data_df) == 0:
         return new_data_df
     
-    # Create filters based on mode
-    duplicate_filters = []
-    
-    if duplicate_check_mode in ["cas", "both"]:
-        # Filter by CAS Number
-        if "CAS Number" in existing_df.columns:
-            existing_cas = set(existing_df["CAS Number"].dropna().astype(str).str.strip().str.lower())
-            existing_cas.discard("nda")  # Remove NDA entries from duplicate check
-            cas_filter = ~new_data_df["CAS Number"].str.strip().str.lower().isin(existing_cas)
-            duplicate_filters.append(cas_filter)
-    
-    if duplicate_check_mode in ["description", "both"]:
-        # Filter by Description
-        if "Description" in existing_df.columns:
-            existing_desc = set(existing_df["Description"].dropna().astype(str).str.strip().str.lower())
-            desc_filter = ~new_data_df["Description"].str.strip().str.lower().isin(existing_desc)
-            duplicate_filters.append(desc_filter)
+    # Build one keep-mask; each key column narrows it with a hashed isin.
+    # Masks are plain boolean ndarrays, so combining them skips index alignment.
+    combined_filter = None
+    
+    for key in keys:
+        # Skip the remaining keys once every row is already excluded
+        if key not in existing_df.columns or (combined_filter is not None and not combined_filter.any()):
+            continue
+        existing_values = existing_df[key].dropna().astype(str).str.strip().str.lower()
+        if key == "CAS Number":
+            existing_values = existing_values[existing_values != "nda"]  # Remove NDA entries from duplicate check
+        existing_values = pd.Index(existing_values.unique())
+        new_values = new_data_df[key].astype(str).str.strip().str.lower()
+        key_filter = ~new_values.isin(existing_values).to_numpy()
+        # For "both" mode, entry must be new in BOTH CAS and description
+        combined_filter = key_filter if combined_filter is None else combined_filter & key_filter
     
     # Apply filters
-    if duplicate_filters:
-        if duplicate_check_mode == "both":
-            # For "both" mode, entry must be new in BOTH CAS and description
-            combined_filter = duplicate_filters[0] & duplicate_filters[1]
-        else:
-            # For single criteria, use that filter
-            combined_filter = duplicate_filters[0]
-        
-        filtered_df = new_data_df[combined_filter]
+    if combined_filter is not None:
+        filtered_df = new_data_df.loc[combined_filter]
         logger.info(f"Duplicate check ({duplicate_check_mode}): {len(new_data_df)} -> {len(filtered_df)} entries")
         return filtered_df
     
     return new_data_df
 
+def write_sds_workbook(output_path, frames, sheet_name='SDS_Data'):
+    """Write DataFrames (same columns) one after another to xlsx with xlsxwriter in constant-memory mode.
+
+    constant_memory flushes each row once the next one starts, so rows must be
+    written strictly in order; pandas' to_excel writes column by column, which
+    is why the rows are written here directly.
+    """
+    workbook = xlsxwriter.Workbook(output_path, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        # Text from PDFs or the uploaded sheet that starts with '=' stays text, not a formula
+        'strings_to_formulas': False,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        # Same header style pandas uses for to_excel
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        worksheet.write_row(0, 0, [str(col) for col in frames[0].columns], header_format)
+        
+        row_idx = 1
+        for df in frames:
+            # Missing values (NaN/NaT) are left as empty cells
+            values = df.astype(object).where(df.notna(), None)
+            for row in values.itertuples(index=False, name=None):
+                worksheet.write_row(row_idx, 0, row)
+                row_idx += 1
+    finally:
+        workbook.close()
+
 @app.route('/')
 def index():
     return jsonify({
@@ -763,6 +1251,371 @@ def index():
         }
     })
 
+def process_upload(session_id, pdf_paths, hash_by_path, excel_path, excel_hash, merge_duplicates, duplicate_check,
+                   progress=None, known_parses=None, output_path=None):
+    """Extract the saved PDFs and merge them into the saved Excel sheet; returns (response dict, HTTP status)
+
+    progress, if given, is called with a dict for each distinct PDF once its result is known.
+    known_parses maps PDF hashes to parse results already known to the caller; those
+    PDFs are neither looked up in the parse cache nor parsed (nor read from disk).
+    output_path, if given, is where the workbook is written instead of the shared
+    download path in /tmp; the response names the same outputFile either way.
+    """
+    # Process PDF files and extract SDS data
+    all_data = []
+    processed_files = 0
+    skipped_files = []
+
+    # Look up each PDF in the parse cache by content hash; identical PDFs
+    # within this upload are only parsed once
+    pdf_hashes = [hash_by_path[pdf_path] for pdf_path in pdf_paths]
+    parsed_by_hash = {}
+    cached_paths = []
+    to_parse = []
+    for pdf_path, sha in zip(pdf_paths, pdf_hashes):
+        if sha in parsed_by_hash:
+            continue
+        cached = known_parses.get(sha) if known_parses else None
+        if cached is None:
+            cached = _load_cached_parse(sha)
+        if cached is not None:
+            logger.info(f"Using cached parse result for {os.path.basename(pdf_path)}")
+            parsed_by_hash[sha] = (cached, None)
+            cached_paths.append(pdf_path)
+        else:
+            parsed_by_hash[sha] = None
+            to_parse.append((pdf_path, sha))
+
+    if progress is not None:
+        for done, pdf_path in enumerate(cached_paths, 1):
+            progress({'file': os.path.basename(pdf_path), 'status': 'cached', 'done': done, 'total': len(parsed_by_hash)})
+
+    # Extract and parse the remaining PDFs in parallel
+    if to_parse:
+        max_workers = min(PDF_WORKERS, len(to_parse))
+        with PDF_EXECUTOR(max_workers=max_workers) as executor:
+            futures = [executor.submit(_process_one_pdf, pdf_path) for pdf_path, _ in to_parse]
+            for parsed_count, ((pdf_path, sha), future) in enumerate(zip(to_parse, futures), 1):
+                try:
+                    filename, parsed_data, error = future.result()
+                except Exception as e:
+                    filename, parsed_data, error = os.path.basename(pdf_path), None, f"processing error: {str(e)}"
+                    logger.error(f"Error processing {filename}: {str(e)}")
+
+                parsed_by_hash[sha] = (parsed_data, error)
+                if parsed_data is not None:
+                    _store_cached_parse(sha, parsed_data)
+                if progress is not None:
+                    progress({
+                        'file': filename,
+                        'status': 'parsed' if parsed_data is not None else 'failed',
+                        'done': len(cached_paths) + parsed_count,
+                        'total': len(parsed_by_hash)
+                    })
+
+    # Collect results in upload order; each row gets its own filename as Description
+    for pdf_path, sha in zip(pdf_paths, pdf_hashes):
+        filename = os.path.basename(pdf_path)
+        parsed_data, error = parsed_by_hash[sha]
+        if parsed_data is not None:
+            row = dict(parsed_data)
+            row["Description"] = os.path.splitext(filename)[0]
+            all_data.append(row)
+            processed_files += 1
+        else:
+            skipped_files.append(f"{filename} ({error})")
+
+    if not all_data:
+        return {'error': 'No valid SDS data could be extracted from any PDF files. Please check if the PDFs contain readable text.'}, 400
+
+    logger.info(f"Extracted data from {processed_files} files")
+
+    # Create DataFrame with proper column structure, optionally merged by CAS Number
+    new_data_df = _categorize(merge_by_cas_number_optional(all_data, merge_duplicates))
+
+    # Set when the uploaded workbook can be returned as it is
+    unchanged_output = False
+
+    # Read existing Excel file
+    if not os.path.exists(excel_path):
+        output_frames = [new_data_df]
+        new_entries = new_data_df
+    else:
+        try:
+            # A sheet this server wrote (or read) before is loaded from its Feather copy
+            existing_df = _load_cached_sheet(excel_hash)
+            if existing_df is not None:
+                logger.info(f"Loaded existing Excel with {len(existing_df)} rows from sheet cache")
+            else:
+                # Only the known columns are parsed, and cell values are kept as read
+                # (dtype=object skips per-column type inference)
+                existing_df = pd.read_excel(excel_path, sheet_name=0, usecols=lambda col: col in _COLUMNS_SET, dtype=object)
+                logger.info(f"Read existing Excel with {len(existing_df)} rows")
+
+                # Add any missing required columns and put them in COLUMNS order
+                existing_df = _categorize(existing_df.reindex(columns=_COLUMN_INDEX, fill_value="NDA"))
+                _store_cached_sheet(excel_hash, existing_df)
+
+            # Check for duplicates based on specified criteria
+            new_entries = check_for_duplicates(existing_df, new_data_df, duplicate_check)
+
+            # Existing rows followed by the new ones; written in sequence, not concatenated
+            output_frames = [existing_df]
+            if len(new_entries):
+                output_frames.append(new_entries)
+            else:
+                # A workbook this server wrote is already exactly the normalised sheet
+                unchanged_output = _is_server_output(excel_hash)
+
+        except (OSError, ValueError, KeyError, ImportError, zipfile.BadZipFile, InvalidFileException) as e:
+            logger.error(f"Error reading Excel file: {str(e)}")
+            # If we can't read the existing file, just use the new data
+            output_frames = [new_data_df]
+            new_entries = new_data_df
+
+    # Save to new Excel file
+    output_filename = "extracted_msds.xlsx"
+    if output_path is None:
+        output_path = os.path.join("/tmp", output_filename)
+    # Every upload writes its own file and renames it into place when done; the shared
+    # output path is never read back, since another upload may replace it at any time
+    tmp_output_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        if unchanged_output:
+            # No new rows for one of our own outputs: the upload is the output (and is cached already)
+            shutil.copyfile(excel_path, tmp_output_path)
+            logger.info(f"No new entries, returning the uploaded workbook as {output_filename}")
+        else:
+            # Save with proper formatting
+            write_sds_workbook(tmp_output_path, output_frames)
+
+            logger.info(f"Saved updated Excel file: {output_filename}")
+
+            # Users usually upload the downloaded output again next time; cache it under its own hash
+            # (concatenated once, and only when there are new rows)
+            if len(output_frames) == 1:
+                output_df = output_frames[0]
+            else:
+                output_df = _concat_sheets(output_frames)
+            output_hash = _file_sha256(tmp_output_path)
+            _store_cached_sheet(output_hash, output_df)
+            _mark_server_output(output_hash)
+
+        os.replace(tmp_output_path, output_path)
+    except Exception:
+        try:
+            os.remove(tmp_output_path)
+        except OSError:
+            pass
+        raise
+
+    # Prepare response message
+    new_entries_count = len(new_entries)
+    message_parts = [f'Successfully processed {processed_files} PDF files']
+    if new_entries_count > 0:
+        message_parts.append(f', added {new_entries_count} new entries')
+    else:
+        message_parts.append(', no new entries added')
+        if duplicate_check != "none":
+            message_parts.append(f' (duplicate check: {duplicate_check})')
+
+    if merge_duplicates and len(new_data_df) != len(all_data):
+        message_parts.append(f' (merged {len(all_data)} entries into {len(new_data_df)} unique entries by CAS Number)')
+    message = ''.join(message_parts)
+
+    response_data = {
+        'success': True,
+        'message': message,
+        'outputFile': output_filename,
+        'sessionId': session_id,
+        'processedFiles': processed_files,
+        'totalFiles': len(pdf_paths),
+        'newEntriesAdded': new_entries_count,
+        'totalEntriesInOutput': sum(len(frame) for frame in output_frames),
+        'processingOptions': {
+            'mergeDuplicates': merge_duplicates,
+            'duplicateCheck': duplicate_check
+        }
+    }
+
+    if skipped_files:
+        response_data['skippedFiles'] = skipped_files
+
+    return response_data, 200
+
+# Background upload jobs. Status is kept on disk so any gunicorn worker can answer a poll.
+UPLOAD_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.environ.get('UPLOAD_JOB_WORKERS', '2')))
+# Send background jobs to the Celery worker service (tasks.py) instead of this process's
+# thread pool; on by default when a Redis broker is configured
+USE_CELERY = os.environ.get('USE_CELERY', 'true' if os.environ.get('REDIS_URL') else 'false').lower() == 'true'
+
+def _encode_upload(file_storage):
+    """Uploaded file as a Celery-serialisable dict, read straight from the request.
+
+    The worker service has its own disk, so the file is not saved here first.
+    """
+    data = file_storage.stream.read()
+    return {
+        'name': secure_filename(file_storage.filename),
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'data': data
+    }
+
+def _encode_pdf_uploads(pdf_files):
+    """_encode_upload each PDF, sending the bytes of each distinct PDF at most once.
+
+    Repeats of a PDF within the upload, and PDFs whose parse result is cached on
+    this service, are sent without their bytes ('data' None); cached results are
+    sent instead in 'parsed', so the worker neither receives nor parses them.
+    """
+    pdf_uploads = []
+    seen = set()
+    for pdf_file in pdf_files:
+        upload = _encode_upload(pdf_file)
+        if upload['sha256'] in seen:
+            upload['data'] = None
+        else:
+            seen.add(upload['sha256'])
+            cached = _load_cached_parse(upload['sha256'])
+            if cached is not None:
+                upload['data'] = None
+                upload['parsed'] = cached
+        pdf_uploads.append(upload)
+    return pdf_uploads
+
+def _decode_upload(session_dir, upload):
+    """Write an _encode_upload dict into session_dir (unless sent without bytes); returns its path and hash"""
+    path = os.path.join(session_dir, secure_filename(upload['name']))
+    if upload['data'] is not None:
+        with open(path, 'wb') as f:
+            f.write(upload['data'])
+    return path, upload['sha256']
+
+def process_encoded_upload(session_id, pdf_uploads, excel_upload, merge_duplicates, duplicate_check):
+    """process_upload for _encode_upload'ed files, run by the Celery worker.
+
+    The output workbook's bytes are returned in 'outputData', for the web
+    service to write where /api/download serves it from.
+    """
+    # The worker has its own disk, so it expires its own sessions and caches
+    UPLOAD_JOB_EXECUTOR.submit(_cleanup_in_background)
+    
+    session_dir = os.path.join(UPLOAD_FOLDER, session_id)
+    os.makedirs(session_dir, exist_ok=True)
+    
+    pdf_paths = []
+    hash_by_path = {}
+    known_parses = {}
+    for upload in pdf_uploads:
+        pdf_path, sha = _decode_upload(session_dir, upload)
+        hash_by_path[pdf_path] = sha
+        pdf_paths.append(pdf_path)
+        if upload.get('parsed') is not None:
+            known_parses[sha] = upload['parsed']
+    excel_path, excel_hash = _decode_upload(session_dir, excel_upload)
+    
+    # This job's own output file: tasks run concurrently on the worker, so the shared
+    # /tmp output may belong to another job. (secure_filename strips leading dots,
+    # so no uploaded file in the session folder can have this name.)
+    output_path = os.path.join(session_dir, ".output.xlsx")
+    response_data, status_code = process_upload(session_id, pdf_paths, hash_by_path, excel_path, excel_hash,
+                                                 merge_duplicates, duplicate_check, known_parses=known_parses,
+                                                 output_path=output_path)
+    if status_code == 200:
+        with open(output_path, 'rb') as f:
+            response_data['outputData'] = f.read()
+    return response_data, status_code
+
+def _collect_celery_job(session_id):
+    """Record the outcome of a finished Celery upload job; returns None while it is still running"""
+    from tasks import process_pdfs_task
+    result = process_pdfs_task.AsyncResult(session_id)
+    if not result.ready():
+        return None
+    
+    if result.successful():
+        status_code = result.result['httpStatus']
+        response_data = result.result['result']
+        output_data = response_data.pop('outputData', None)
+        if output_data is not None:
+            output_path = os.path.join("/tmp", secure_filename(response_data['outputFile']))
+            tmp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(output_data)
+            os.replace(tmp_path, output_path)
+    else:
+        error_msg = f"Upload processing error: {str(result.result)}"
+        logger.error(error_msg)
+        status_code, response_data = 500, {'error': error_msg}
+    
+    job = {
+        'status': 'done' if status_code == 200 else 'failed',
+        'httpStatus': status_code,
+        'result': response_data
+    }
+    # Later polls are answered from disk; the result backend copy is no longer needed
+    _write_job_status(session_id, job)
+    result.forget()
+    return job
+
+def _write_job_status(session_id, payload):
+    """Record a job's status; written to a temp file and renamed into place"""
+    status_path = os.path.join(JOBS_FOLDER, session_id + ".json")
+    tmp_path = f"{status_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, status_path)
+
+def _job_accepted(session_id):
+    """202 response for a background upload job; the client polls /api/status"""
+    return jsonify({
+        'success': True,
+        'sessionId': session_id,
+        'status': 'processing',
+        'statusUrl': f'/api/status/{session_id}'
+    }), 202
+
+def _stream_upload(job_args):
+    """NDJSON response for process_upload: a 'progress' line per PDF as it completes, then the 'result' line"""
+    events = queue.Queue()
+    outcome = {}
+    
+    def run():
+        try:
+            outcome['result'] = process_upload(*job_args, progress=events.put)
+        except Exception as e:
+            error_msg = f"Upload processing error: {str(e)}"
+            logger.error(error_msg)
+            outcome['result'] = {'error': error_msg}, 500
+        finally:
+            events.put(None)
+    
+    def generate():
+        option = ORJSONProvider.option | orjson.OPT_APPEND_NEWLINE
+        while (event := events.get()) is not None:
+            yield orjson.dumps({'event': 'progress', **event}, option=option)
+        response_data, status_code = outcome['result']
+        # The 200 status line is already sent, so the real status travels in the last line
+        yield orjson.dumps({'event': 'result', 'httpStatus': status_code, **response_data}, option=option)
+    
+    threading.Thread(target=run, daemon=True).start()
+    return app.response_class(generate(), mimetype='application/x-ndjson')
+
+def _run_upload_job(session_id, *args):
+    """Run process_upload in the background and record its outcome"""
+    try:
+        response_data, status_code = process_upload(session_id, *args)
+    except Exception as e:
+        error_msg = f"Upload processing error: {str(e)}"
+        logger.error(error_msg)
+        response_data, status_code = {'error': error_msg}, 500
+    _write_job_status(session_id, {
+        'status': 'done' if status_code == 200 else 'failed',
+        'httpStatus': status_code,
+        'result': response_data
+    })
+
 @app.route('/api/upload', methods=['POST', 'OPTIONS'])
 
 def upload_files():
@@ -792,194 +1645,206 @@ def upload_files():
         
         # Validate file extensions
         for pdf_file in pdf_files:
-            if not allowed_file(pdf_file.filename, ALLOWED_EXTENSIONS_PDF):
+            if not allowed_file(pdf_file.filename, _PDF_SUFFIXES):
                 return jsonify({'error': f'Invalid PDF file format: {pdf_file.filename}'}), 400
         
-        if not allowed_file(excel_file.filename, ALLOWED_EXTENSIONS_EXCEL):
+        if not allowed_file(excel_file.filename, _EXCEL_SUFFIXES):
             return jsonify({'error': 'Invalid Excel file format'}), 400
         
         # Create unique session ID for this upload
         session_id = str(uuid.uuid4())
+        # Opt-in background processing: respond 202 now and let the client poll /api/status
+        run_async = request.form.get('async', 'false').lower() == 'true'
+        
+        # Remove expired sessions in the background (at most once per CLEANUP_INTERVAL)
+        UPLOAD_JOB_EXECUTOR.submit(_cleanup_in_background)
+        
+        if run_async and USE_CELERY:
+            # The job message carries the files to the worker, so they are not saved here
+            from tasks import process_pdfs_task  # Celery is only needed on this path
+            pdf_uploads = _encode_pdf_uploads(pdf_files)
+            excel_upload = _encode_upload(excel_file)
+            process_pdfs_task.apply_async(
+                args=(session_id, pdf_uploads, excel_upload, merge_duplicates, duplicate_check),
+                task_id=session_id
+            )
+            # Only once the broker has the job: a failed dispatch must not leave a
+            # status that polls as 'processing' forever (the client has no id before we reply)
+            _write_job_status(session_id, {'status': 'processing', 'celery': True})
+            return _job_accepted(session_id)
+        
         session_dir = os.path.join(UPLOAD_FOLDER, session_id)
         os.makedirs(session_dir, exist_ok=True)
         
         # Save uploaded files
+        # (PDFs are hashed while they are written, for the parse cache lookup below)
         pdf_paths = []
+        hash_by_path = {}
         for pdf_file in pdf_files:
             pdf_path = os.path.join(session_dir, secure_filename(pdf_file.filename))
-            pdf_file.save(pdf_path)
+            hash_by_path[pdf_path] = _save_upload(pdf_file, pdf_path)
             pdf_paths.append(pdf_path)
             logger.info(f"Saved PDF: {pdf_file.filename}")
         
         excel_path = os.path.join(session_dir, secure_filename(excel_file.filename))
-        excel_file.save(excel_path)
+        excel_hash = _save_upload(excel_file, excel_path)
         logger.info(f"Saved Excel: {excel_file.filename}")
         
-        # Process PDF files and extract SDS data
-        all_data = []
-        processed_files = 0
-        skipped_files = []
-        
-        for pdf_path in pdf_paths:
-            filename = os.path.basename(pdf_path)
-            try:
-                logger.info(f"Processing {filename}...")
-                text = extract_pdf_text(pdf_path)
-                
-                if text.strip():  # Only process if we got text
-                    parsed_data = parse_sds_data(text, filename)
-                    all_data.append(parsed_data)
-                    processed_files += 1
-                    logger.info(f"Successfully processed {filename}")
-                else:
-                    skipped_files.append(f"{filename} (no text extracted)")
-                    logger.warning(f"No text extracted from {filename}")
-            except Exception as e:
-                error_msg = f"Error processing {filename}: {str(e)}"
-                logger.error(error_msg)
-                skipped_files.append(f"{filename} (processing error: {str(e)})")
-        
-        if not all_data:
-            return jsonify({'error': 'No valid SDS data could be extracted from any PDF files. Please check if the PDFs contain readable text.'}), 400
-        
-        logger.info(f"Extracted data from {processed_files} files")
+        job_args = (session_id, pdf_paths, hash_by_path, excel_path, excel_hash, merge_duplicates, duplicate_check)
+        if run_async:
+            _write_job_status(session_id, {'status': 'processing'})
+            UPLOAD_JOB_EXECUTOR.submit(_run_upload_job, *job_args)
+            return _job_accepted(session_id)
         
-        # Optionally merge data by CAS Number
-        processed_data = merge_by_cas_number_optional(all_data, merge_duplicates)
+        # Opt-in progress streaming (NDJSON) for synchronous uploads
+        if request.form.get('stream', 'false').lower() == 'true':
+            return _stream_upload(job_args)
         
-        # Create DataFrame with proper column structure
-        new_data_df = pd.DataFrame(processed_data)
-        
-        # Ensure all required columns exist
-        for col in COLUMNS:
-            if col not in new_data_df.columns:
-                new_data_df[col] = "NDA"
-        
-        # Reorder columns
-        new_data_df = new_data_df[COLUMNS]
-        
-        # Read existing Excel file
-        try:
-            existing_df = pd.read_excel(excel_path)
-            logger.info(f"Read existing Excel with {len(existing_df)} rows")
-            
-            # Ensure existing DataFrame has all required columns
-            for col in COLUMNS:
-                if col not in existing_df.columns:
-                    existing_df[col] = "NDA"
-            
-            # Reorder columns to match COLUMNS order
-            existing_df = existing_df.reindex(columns=COLUMNS, fill_value="NDA")
-            
-            # Check for duplicates based on specified criteria
-            new_entries = check_for_duplicates(existing_df, new_data_df, duplicate_check)
-            
-            # Combine existing and new data
-            if len(new_entries) > 0:
-                combined_df = pd.concat([existing_df, new_entries], ignore_index=True)
-            else:
-                combined_df = existing_df
-                
-        except Exception as e:
-            logger.error(f"Error reading Excel file: {str(e)}")
-            # If we can't read the existing file, just use the new data
-            combined_df = new_data_df
-            new_entries = new_data_df
-        
-        # Save to new Excel file
-        output_filename = "extracted_msds.xlsx"
-        output_path = os.path.join("/tmp", output_filename)
-
-        
-        # Save with proper formatting
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            combined_df.to_excel(writer, index=False, sheet_name='SDS_Data')
-            
-        logger.info(f"Saved updated Excel file: {output_filename}")
-        
-        # Prepare response message
-        message = f'Successfully processed {processed_files} PDF files'
-        if 'new_entries' in locals() and len(new_entries) > 0:
-            message += f', added {len(new_entries)} new entries'
-        else:
-            message += ', no new entries added'
-            if duplicate_check != "none":
-                message += f' (duplicate check: {duplicate_check})'
-            
-        if merge_duplicates and len(processed_data) != len(all_data):
-            message += f' (merged {len(all_data)} entries into {len(processed_data)} unique entries by CAS Number)'
-        
-        response_data = {
-            'success': True,
-            'message': message,
-            'outputFile': output_filename,
-            'sessionId': session_id,
-            'processedFiles': processed_files,
-            'totalFiles': len(pdf_files),
-            'newEntriesAdded': len(new_entries) if 'new_entries' in locals() else len(new_data_df),
-            'totalEntriesInOutput': len(combined_df),
-            'processingOptions': {
-                'mergeDuplicates': merge_duplicates,
-                'duplicateCheck': duplicate_check
-            }
-        }
-        
-        if skipped_files:
-            response_data['skippedFiles'] = skipped_files
-        
-        return jsonify(response_data)
+        response_data, status_code = process_upload(*job_args)
+        return jsonify(response_data), status_code
     
     except Exception as e:
         error_msg = f"Upload processing error: {str(e)}"
         logger.error(error_msg)
         return jsonify({'error': error_msg}), 500
 
+@app.route('/api/status/<session_id>', methods=['GET'])
+def upload_status(session_id):
+    """Status of a background upload job; once finished, returns the upload response"""
+    status_path = os.path.join(JOBS_FOLDER, secure_filename(session_id) + ".json")
+    try:
+        with open(status_path, 'r', encoding='utf-8') as f:
+            job = json.load(f)
+    except FileNotFoundError:
+        return jsonify({'error': 'Unknown session'}), 404
+    
+    if job['status'] == 'processing' and job.get('celery'):
+        try:
+            job = _collect_celery_job(session_id) or job
+        except Exception as e:
+            # e.g. Redis (broker/result backend) unreachable
+            error_msg = f"Error checking job status: {str(e)}"
+            logger.error(error_msg)
+            return jsonify({'error': error_msg}), 500
+    if job['status'] == 'processing':
+        return jsonify({'sessionId': session_id, 'status': 'processing'})
+    return jsonify({**job['result'], 'status': job['status']}), job['httpStatus']
+
+@functools.lru_cache(maxsize=256)
+def _output_path(filename):
+    """Path in /tmp for a requested download name (the same few names are requested repeatedly)"""
+    return os.path.join("/tmp", secure_filename(filename))
+
 @app.route('/api/download/<filename>', methods=['GET'])
 def download_file(filename):
     try:
-        file_path = os.path.join("/tmp", secure_filename(filename))
-        if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
-        else:
-            return jsonify({'error': 'File not found'}), 404
+        # Conditional GET (ETag/Last-Modified, 304 and Range). The output name is reused
+        # for every upload, so clients must revalidate rather than cache for a fixed time.
+        # send_file stats the file anyway, so a missing file is caught instead of checked first.
+        return send_file(_output_path(filename), as_attachment=True, conditional=True, etag=True, max_age=0)
+    except FileNotFoundError:
+        return jsonify({'error': 'File not found'}), 404
     except Exception as e:
         return jsonify({'error': f'Error downloading file: {str(e)}'}), 500
 
 
 
-@app.route('/api/cleanup', methods=['POST'])
-def cleanup_old_files():
+# Threads used to delete stale sessions and files in /api/cleanup
+CLEANUP_WORKERS = 8
+# Minimum seconds between cleanup scans (per process); uploads also start one when due
+CLEANUP_INTERVAL = 60
+_cleanup_lock = threading.Lock()
+_last_cleanup_ts = 0.0
+
+def _remove_stale_file(name, dir_fd):
+    """Delete one file for cleanup, relative to its directory's fd; returns True if it was removed"""
     try:
-        # Remove files older than 24 hours
-        cutoff_time = datetime.now() - timedelta(hours=24)
-        cleaned_sessions = 0
-        cleaned_files = 0
-        
-        # Clean up upload folder
-        if os.path.exists(UPLOAD_FOLDER):
-            for session_id in os.listdir(UPLOAD_FOLDER):
-                session_dir = os.path.join(UPLOAD_FOLDER, session_id)
-                if os.path.isdir(session_dir):
-                    try:
-                        created_time = datetime.fromtimestamp(os.path.getctime(session_dir))
-                        if created_time < cutoff_time:
-                            shutil.rmtree(session_dir, ignore_errors=True)
-                            cleaned_sessions += 1
-                    except Exception as e:
-                        logger.error(f"Error cleaning session {session_id}: {str(e)}")
-        
-        # Clean up processed folder
-        tmp_dir = '/tmp'
-        if os.path.exists(tmp_dir):
-            for filename in os.listdir(tmp_dir):
-                file_path = os.path.join(tmp_dir, filename)
+        os.unlink(name, dir_fd=dir_fd)
+        return True
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        logger.error(f"Error cleaning file {name}: {str(e)}")
+        return False
+
+def _purge_stale(root, cutoff_ts, include_dirs, file_suffix=None):
+    """Delete the entries of root last changed before cutoff_ts; returns (dirs removed, files removed).
+
+    Subdirectories are removed only if include_dirs, and files only if they end
+    with file_suffix (when given). Files are unlinked relative to one fd for root,
+    so the kernel does not resolve the full path again for each of them.
+    """
+    stale_dirs = []
+    stale_files = []
+    try:
+        # scandir entries carry their file type, so only ctime needs a stat
+        with os.scandir(root) as entries:
+            for entry in entries:
                 try:
-                    created_time = datetime.fromtimestamp(os.path.getctime(file_path))
-                    if created_time < cutoff_time:
-                        os.remove(file_path)
-                        cleaned_files += 1
+                    if entry.is_dir(follow_symlinks=False):
+                        if include_dirs and entry.stat(follow_symlinks=False).st_ctime < cutoff_ts:
+                            stale_dirs.append(entry.path)
+                    elif not file_suffix or entry.name.endswith(file_suffix):
+                        if entry.stat(follow_symlinks=False).st_ctime < cutoff_ts:
+                            stale_files.append(entry.name)
                 except Exception as e:
-                    logger.error(f"Error cleaning file {filename}: {str(e)}")
+                    logger.error(f"Error cleaning {entry.name}: {str(e)}")
+    except FileNotFoundError:
+        return 0, 0
+    
+    if not stale_dirs and not stale_files:
+        return 0, 0
+    
+    # Deletions are I/O-bound; run them concurrently
+    dir_fd = os.open(root, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS) as executor:
+            executor.map(lambda path: shutil.rmtree(path, ignore_errors=True), stale_dirs)
+            removed_files = sum(executor.map(lambda name: _remove_stale_file(name, dir_fd), stale_files))
+    finally:
+        os.close(dir_fd)
+    return len(stale_dirs), removed_files
+
+def _cleanup_stale_files():
+    """Remove sessions and files older than 24 hours, and cache entries unused for CACHE_MAX_AGE_HOURS;
+    returns (sessions, files) removed, or None if a cleanup already ran within CLEANUP_INTERVAL"""
+    global _last_cleanup_ts
+    with _cleanup_lock:
+        now = time.time()
+        if now - _last_cleanup_ts < CLEANUP_INTERVAL:
+            return None
+        _last_cleanup_ts = now
+    
+    cutoff_ts = now - timedelta(hours=24).total_seconds()
+    # Session folders, and upload spool files left behind by a worker that died mid-request
+    cleaned_sessions, cleaned_spool_files = _purge_stale(UPLOAD_FOLDER, cutoff_ts, include_dirs=True, file_suffix='.part')
+    # Output files
+    _, cleaned_files = _purge_stale('/tmp', cutoff_ts, include_dirs=False)
+    # Status files of upload jobs
+    _, cleaned_jobs = _purge_stale(JOBS_FOLDER, cutoff_ts, include_dirs=False)
+    # Parse cache, and cached sheets with their .output markers
+    cache_cutoff_ts = now - timedelta(hours=CACHE_MAX_AGE_HOURS).total_seconds()
+    _, cleaned_parses = _purge_stale(PARSE_CACHE_FOLDER, cache_cutoff_ts, include_dirs=False)
+    _, cleaned_sheets = _purge_stale(SHEET_CACHE_FOLDER, cache_cutoff_ts, include_dirs=False)
+    return cleaned_sessions, cleaned_spool_files + cleaned_files + cleaned_jobs + cleaned_parses + cleaned_sheets
+
+def _cleanup_in_background():
+    """_cleanup_stale_files for the upload route's background thread; errors are only logged"""
+    try:
+        _cleanup_stale_files()
+    except Exception as e:
+        logger.error(f"Error during cleanup: {str(e)}")
+
+@app.route('/api/cleanup', methods=['POST'])
+def cleanup_old_files():
+    try:
+        cleaned = _cleanup_stale_files()
+        if cleaned is None:
+            return jsonify({
+                'success': True,
+                'message': f'Cleanup skipped: already ran in the last {CLEANUP_INTERVAL} seconds'
+            })
+        cleaned_sessions, cleaned_files = cleaned
         
         return jsonify({
             'success': True, 
@@ -1009,4 +1874,8 @@ if __name__ == '__main__':
     print("🎛️  Processing options:")
     print("   - mergeDuplicates: Merge entries with same CAS number")
     print("   - duplicateCheck: none|cas|description|both")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # The debugger and reloader are for local development only
+    debug = os.environ.get('FLASK_ENV') == 'development'
+    if not debug:
+        print("ℹ️  Development server; in production run: gunicorn app:app --workers 2 --threads 4 --worker-tmp-dir /dev/shm")
+    app.run(debug=debug, host='0.0.0.0', port=5000)
@@ -1,13 +1,28 @@
 from celery import Celery
-import time
 import os
 
-# Connect to Redis (replace with your Render Redis URL later)
-celery = Celery("tasks", broker=os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+# Connect to Redis; it also holds task results until the web service collects them
+celery = Celery("tasks", broker=REDIS_URL, backend=REDIS_URL)
+celery.conf.update(
+    # Acknowledge a job only once it has finished, so a job on a worker that dies is redelivered
+    task_acks_late=True,
+    # Jobs are long: take one at a time instead of prefetching a batch per worker
+    worker_prefetch_multiplier=1,
+    result_expires=24 * 60 * 60,
+    # msgpack carries the job's file bytes as they are (JSON would need base64, a third larger)
+    task_serializer='msgpack',
+    result_serializer='msgpack',
+    accept_content=['msgpack'],
+    result_accept_content=['msgpack'],
+)
 
 @celery.task
-def process_pdfs_task(file_paths):
-    for path in file_paths:
-        # Simulate PDF processing
-        print(f"Processing: {path}")
-        time.sleep(2)  # Simulate a time-consuming task
+def process_pdfs_task(session_id, pdf_uploads, excel_upload, merge_duplicates, duplicate_check):
+    """Run an upload job for app.py; the files arrive in the message since the web and worker services don't share a disk"""
+    # Imported here because app imports this module (lazily) to dispatch jobs
+    from app import process_encoded_upload
+    response_data, status_code = process_encoded_upload(session_id, pdf_uploads, excel_upload,
+                                                        merge_duplicates, duplicate_check)
+    return {'httpStatus': status_code, 'result': response_data}